@@ -6,41 +6,38 @@ These cause encoding issues, look AI-generated, and serve no purpose
 in code or documentation.
 """
 
+import functools
 import json
+import os
 import re
 import sys
-from pathlib import Path
+from bisect import bisect_right
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
-_HOOK_DIR = Path(__file__).resolve().parent
-_config_cache = None
+_HOOK_DIR = os.path.dirname(os.path.realpath(__file__))
 
 
+@functools.lru_cache(maxsize=1)
 def _load_config():
     """Load config.json from the same directory as the hook script.
 
     Keys are lowercased for case-insensitive matching.
     """
-    global _config_cache
-    if _config_cache is not None:
-        return _config_cache
-
-    config_path = _HOOK_DIR / "config.json"
-    _config_cache = {}
+    config_path = os.path.join(_HOOK_DIR, "config.json")
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             raw = json.load(f)
-        if isinstance(raw, dict):
-            _config_cache = {
-                k.lower(): v for k, v in raw.items()
-                if not k.startswith("_") and isinstance(v, bool)
-            }
     except (OSError, json.JSONDecodeError, ValueError):
-        pass
-    return _config_cache
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    return {
+        k.lower(): v for k, v in raw.items()
+        if not k.startswith("_") and isinstance(v, bool)
+    }
 
 
 def _is_enabled(check_id, default=None):
@@ -64,19 +61,64 @@ BLOCKED_RANGES = [
 ]
 
 
+def _merge_ranges(ranges):
+    """Sort and merge overlapping ranges into parallel (lows, highs, categories).
+
+    When ranges overlap, the category of the range listed first wins.
+    """
+    order = sorted(range(len(ranges)), key=lambda i: ranges[i][0])
+    merged = []  # [low, high, first_index]
+    for i in order:
+        low, high, _ = ranges[i]
+        if merged and low <= merged[-1][1]:
+            prev = merged[-1]
+            prev[1] = max(prev[1], high)
+            prev[2] = min(prev[2], i)
+        else:
+            merged.append([low, high, i])
+    return (
+        [low for low, _, _ in merged],
+        [high for _, high, _ in merged],
+        [ranges[i][2] for _, _, i in merged],
+    )
+
+
+_LOWS, _HIGHS, _CATS = _merge_ranges(BLOCKED_RANGES)
+
+# Single character class covering every blocked range, so the scan runs
+# inside the regex engine instead of a per-character Python loop.
+_BLOCKED_RE = re.compile(
+    "["
+    + "".join(f"\\U{low:08X}-\\U{high:08X}" for low, high in zip(_LOWS, _HIGHS))
+    + "]"
+)
+
+
+def _lookup_category(cp):
+    """Return the category of the merged range containing cp, or None."""
+    idx = bisect_right(_LOWS, cp) - 1
+    if idx >= 0 and cp <= _HIGHS[idx]:
+        return _CATS[idx]
+    return None
+
+
 def find_blocked_char(text):
     """Return (char, codepoint, category) for the first blocked character, or None."""
-    for char in text:
-        cp = ord(char)
-        for low, high, category in BLOCKED_RANGES:
-            if low <= cp <= high:
-                return char, cp, category
-    return None
+    m = _BLOCKED_RE.search(text)
+    if not m:
+        return None
+    char = m.group(0)
+    cp = ord(char)
+    return char, cp, _lookup_category(cp)
 
 
 def main():
+    raw = sys.stdin.buffer.read()
+    # Cheap byte check before parsing: only Write and Edit payloads matter
+    if b'"Write"' not in raw and b'"Edit"' not in raw:
+        sys.exit(0)
     try:
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(raw)
     except (json.JSONDecodeError, ValueError):
         sys.exit(0)
 
@@ -93,6 +135,10 @@ def main():
     if not content:
         sys.exit(0)
 
+    # Pure ASCII cannot contain any blocked character
+    if content.isascii():
+        sys.exit(0)
+
     if not _is_enabled("file_content_unicode", default=False):
         sys.exit(0)
 
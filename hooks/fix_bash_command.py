@@ -9,16 +9,40 @@ Tier 2 (suggest):  blocks with exit 2 and a message showing the proposed fix.
                    Logs to ~/.claude/hooks/fixups.log for review.
 """
 
+import functools
 import json
 import os
 import re
 import sys
-from datetime import datetime
-from pathlib import Path
+import time
+from bisect import bisect_left
+from types import SimpleNamespace
 
-# Log next to this script (project-local hooks get their own log)
-_HOOK_DIR = Path(__file__).resolve().parent
-FIXUPS_LOG = _HOOK_DIR / "fixups.log"
+
+class _LazyPattern:
+    """A regex that is compiled on first use.
+
+    Stands in for a compiled pattern (.search, .finditer, ...). Compiling
+    every pattern at import cost about 2 ms per run, paid even by the
+    commands that main() lets through on its literal fast path.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            self._compiled = re.compile(self._pattern, self._flags)
+        value = getattr(self._compiled, name)
+        setattr(self, name, value)  # later lookups skip __getattr__
+        return value
+
+# Log next to this script (project-local hooks get their own log).
+# Plain os.path strings: pathlib is slow to import and only used for this.
+_HOOK_DIR = os.path.dirname(os.path.realpath(__file__))
+FIXUPS_LOG = os.path.join(_HOOK_DIR, "fixups.log")
 
 
 # ---------------------------------------------------------------------------
@@ -46,9 +70,8 @@ _DEFAULTS = {
     "git_commit_emoji": False,
 }
 
-_config_cache = None
-
 
+@functools.lru_cache(maxsize=1)
 def _load_config():
     """Load config.json from the same directory as the hook script.
 
@@ -57,74 +80,108 @@ def _load_config():
     Keys starting with '_' (comment keys) are ignored.
     Keys are lowercased for case-insensitive matching.
     """
-    global _config_cache
-    if _config_cache is not None:
-        return _config_cache
-
-    config_path = _HOOK_DIR / "config.json"
-    _config_cache = {}
+    config_path = os.path.join(_HOOK_DIR, "config.json")
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             raw = json.load(f)
-        if isinstance(raw, dict):
-            _config_cache = {
-                k.lower(): v for k, v in raw.items()
-                if not k.startswith("_") and isinstance(v, bool)
-            }
     except (OSError, json.JSONDecodeError, ValueError):
-        pass
-    return _config_cache
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    return {
+        k.lower(): v for k, v in raw.items()
+        if not k.startswith("_") and isinstance(v, bool)
+    }
 
 
-def _is_enabled(check_id, default=None):
+def _is_enabled(check_id):
     """Check whether a given check is enabled.
 
     Looks up check_id in config.json first, then falls back to built-in
-    defaults. If the check_id is unknown, uses the provided default
-    (or True if not specified).
+    defaults.
     """
     config = _load_config()
     if check_id in config:
         return config[check_id]
-    if default is not None:
-        return default
-    return _DEFAULTS.get(check_id, True)
+    return _DEFAULTS[check_id]
+
+
+def _resolve_checks():
+    """Resolve every check once into attributes (cfg.nul_redirect, ...).
+
+    Config cannot change during a hook run. main() calls this only after
+    its early exits, so runs that exit early never read config.json.
+    """
+    return SimpleNamespace(**{check_id: _is_enabled(check_id) for check_id in _DEFAULTS})
+
 
 MAX_LOG_LINES = 500
 TRIM_TO_LINES = 250
 
+# Every log entry is well over 64 bytes, so a log smaller than this cannot
+# hold more than MAX_LOG_LINES lines and does not need to be read.
+_TRIM_BYTES_THRESHOLD = MAX_LOG_LINES * 64
 
-def _trim_log_if_needed():
-    """Keep the log file bounded. When it exceeds MAX_LOG_LINES, trim to TRIM_TO_LINES."""
-    try:
-        lines = FIXUPS_LOG.read_text(encoding="utf-8").splitlines()
-    except OSError:
+
+def _trim_log_if_needed(fd, size):
+    """Keep the log file bounded. When it exceeds MAX_LOG_LINES, trim to TRIM_TO_LINES.
+
+    fd is the open O_APPEND log descriptor and size its current length in
+    bytes, so the trim reuses the append session instead of reopening.
+    """
+    if size < _TRIM_BYTES_THRESHOLD:
         return
-    if len(lines) > MAX_LOG_LINES:
-        FIXUPS_LOG.write_text(
-            "\n".join(lines[-TRIM_TO_LINES:]) + "\n",
-            encoding="utf-8",
-        )
+    # Work on raw bytes: counting and slicing at b"\n" avoids decoding the
+    # file and building a list of every line just to keep the tail.
+    os.lseek(fd, 0, os.SEEK_SET)
+    data = os.read(fd, size)
+    if data.count(b"\n") <= MAX_LOG_LINES:
+        return
+    cut = len(data)
+    for _ in range(TRIM_TO_LINES + 1):
+        cut = data.rfind(b"\n", 0, cut)
+    os.ftruncate(fd, 0)
+    os.write(fd, data[cut + 1:])  # O_APPEND: lands at offset 0
+
+
+# O_BINARY only exists (and matters) on Windows
+_LOG_FLAGS = os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+@functools.lru_cache(maxsize=1)
+def _log_context():
+    """Return (timestamp, cwd), computed once per hook run."""
+    return time.strftime("%Y-%m-%d %H:%M:%S"), os.getcwd()
 
 
 def _log_entry(entry_type, fix_type, original, proposed=None, fixes=None):
     """Append a structured log entry."""
-    FIXUPS_LOG.parent.mkdir(parents=True, exist_ok=True)
-    now = datetime.now()
+    timestamp, cwd = _log_context()
     entry = {
-        "time": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "time": timestamp,
         "type": entry_type,
         "fix": fix_type,
-        "cwd": os.getcwd(),
+        "cwd": cwd,
         "original": original,
     }
     if proposed is not None:
         entry["proposed"] = proposed
     if fixes is not None:
         entry["fixes"] = fixes
-    with open(FIXUPS_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
-    _trim_log_if_needed()
+    # Raw UTF-8; a lone surrogate becomes a \udXXX escape, which is still
+    # valid JSON inside the string.
+    line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+    line = (line + "\n").encode("utf-8", "backslashreplace")
+    # The log lives next to this script, so its directory always exists.
+    # On POSIX a single O_APPEND write keeps concurrent hook runs from
+    # interleaving; the Windows CRT emulates O_APPEND with a seek before
+    # each write, so concurrent appends there are not atomic.
+    fd = os.open(FIXUPS_LOG, _LOG_FLAGS, 0o644)
+    try:
+        os.write(fd, line)
+        _trim_log_if_needed(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
 
 
 def log_fixup(original, proposed, fix_type):
@@ -148,19 +205,26 @@ def block(message):
 # https://learn.microsoft.com/en-us/windows/win32/fileio/naming-a-file
 # ---------------------------------------------------------------------------
 
-WINDOWS_RESERVED_NAMES = {
+WINDOWS_RESERVED_NAMES = frozenset({
     "con", "prn", "aux", "nul",
     "com1", "com2", "com3", "com4", "com5", "com6", "com7", "com8", "com9",
     "lpt1", "lpt2", "lpt3", "lpt4", "lpt5", "lpt6", "lpt7", "lpt8", "lpt9",
-}
-
-# Pattern matching reserved names as redirect targets or file arguments.
-# Matches: > con, 2> prn, &> aux, also con.txt (with extension).
-_RESERVED_RE = re.compile(
-    r"(?<!/dev/)((?:&|[012])?>)\s*("
-    + "|".join(WINDOWS_RESERVED_NAMES)
-    + r")(?:\.[\w.]+)?\s*$",
-    re.IGNORECASE | re.MULTILINE,
+})
+
+# Pattern matching candidate redirect targets and file arguments,
+# scanned in a single pass.
+#   redirect: > con, 2> prn, &> aux, also con.txt (with extension); the
+#             name is any short token, tested against WINDOWS_RESERVED_NAMES
+#             by the caller instead of a 22-way alternation in the regex
+#   fileop:   the first argument of a file-creating command (touch con, etc.)
+# Both alternatives are lookaheads so "cat > con" yields a hit for each.
+_RESERVED_RE = _LazyPattern(
+    r"""(?=
+        (?P<redirect>(?im:(?<!/dev/)(?:&|[012])?>\s*
+            (?P<name>[a-z][a-z0-9]{0,4})(?:\.[\w.]+)?\s*$))
+      | (?P<fileop>\b(?:touch|mkdir|cp|mv|cat\s*>|tee)\s+(?P<filename>\S+))
+    )""",
+    re.VERBOSE,
 )
 
 
@@ -169,17 +233,15 @@ _RESERVED_RE = re.compile(
 # ---------------------------------------------------------------------------
 
 _in_wsl = "WSL_DISTRO_NAME" in os.environ
-_wsl_installed = None
 
 
+@functools.lru_cache(maxsize=1)
 def _is_wsl_installed():
-    global _wsl_installed
-    if _wsl_installed is None:
-        _wsl_installed = Path("C:/Windows/System32/wsl.exe").exists()
-    return _wsl_installed
+    """Whether wsl.exe exists. Checked lazily: only wsl invocations need it."""
+    return os.path.exists("C:/Windows/System32/wsl.exe")
 
 
-EMOJI_RE = re.compile(
+EMOJI_RE = _LazyPattern(
     "["
     "\U0001F600-\U0001F64F"  # emoticons
     "\U0001F300-\U0001F5FF"  # misc symbols & pictographs
@@ -198,33 +260,60 @@ EMOJI_RE = re.compile(
 # Tier 2 -- blocking checks (run first so bad commands never execute)
 # ---------------------------------------------------------------------------
 
-def check_git_commit_attribution(cmd):
-    """Block git commit messages with Co-Authored-By."""
-    if not re.search(r"\bgit\s+commit\b", cmd):
-        return
-    if re.search(r"co-authored-by", cmd, re.IGNORECASE):
-        block("Commit message contains Co-Authored-By. "
-              "Remove AI attribution from commit messages.")
+_GIT_COMMIT_RE = _LazyPattern(r"\bgit\s+commit\b")
+_COAUTHOR_RE = _LazyPattern(r"co-authored-by", re.IGNORECASE)
+_GENERATED_RE = _LazyPattern(r"generated with", re.IGNORECASE)
+
 
+def check_git_commit(cmd, attribution=False, generated=False, emoji=False):
+    """Block git commit messages with AI attribution or emoji.
 
-def check_git_commit_generated(cmd):
-    """Block git commit messages with 'Generated with'."""
-    if not re.search(r"\bgit\s+commit\b", cmd):
+    attribution: Co-Authored-By lines
+    generated:   'Generated with' text
+    emoji:       emoji or decorative symbols
+    The git commit anchor is matched once for all three checks.
+    """
+    if not (attribution or generated or emoji):
+        return
+    if "git" not in cmd or not _GIT_COMMIT_RE.search(cmd):
         return
-    if re.search(r"generated with", cmd, re.IGNORECASE):
+    if attribution and _COAUTHOR_RE.search(cmd):
+        block("Commit message contains Co-Authored-By. "
+              "Remove AI attribution from commit messages.")
+    if generated and _GENERATED_RE.search(cmd):
         block("Commit message contains 'Generated with'. "
               "Remove AI attribution from commit messages.")
-
-
-def check_git_commit_emoji(cmd):
-    """Block git commit messages containing emoji."""
-    if not re.search(r"\bgit\s+commit\b", cmd):
-        return
-    if EMOJI_RE.search(cmd):
+    # ASCII-only commands cannot contain emoji; skip the range scan
+    if emoji and not cmd.isascii() and EMOJI_RE.search(cmd):
         block("Commit message contains emoji. "
               "Use plain text in commit messages.")
 
 
+def _is_ascii_letter(ch):
+    """Match [a-zA-Z] (str.isalpha alone accepts any Unicode letter)."""
+    return ch.isascii() and ch.isalpha()
+
+
+def _find_doubled_flag(cmd):
+    """Return the index of the first //flag token in cmd, or None.
+
+    A //flag follows the start of the command or whitespace, has 1-4 ASCII
+    letters, and ends at whitespace, a double quote or the end of the
+    command -- so //server/share and //x1 are not flags.
+    """
+    n = len(cmd)
+    i = cmd.find("//")
+    while i != -1:
+        if i == 0 or cmd[i - 1].isspace():
+            j = i + 2
+            while j < n and j < i + 6 and _is_ascii_letter(cmd[j]):
+                j += 1
+            if j > i + 2 and (j == n or cmd[j].isspace() or cmd[j] == '"'):
+                return i
+        i = cmd.find("//", i + 1)
+    return None
+
+
 def check_doubled_flags(cmd):
     """Fix E: detect unnecessary // flag doubling for Windows commands.
 
@@ -237,21 +326,20 @@ def check_doubled_flags(cmd):
     Doubled slashes break the commands.
     """
     # Skip URLs
-    if re.search(r"https?://", cmd):
+    if "http://" in cmd or "https://" in cmd:
         return
-    for m in re.finditer(r"(?:^|\s)(//([a-zA-Z]{1,4}))(?=\s|$|\")", cmd):
-        flag_full = m.group(1)
-        flag_name = m.group(2)
-        # Skip if it looks like a UNC path (//server/share)
-        after = cmd[m.end(1):]
-        if after.startswith("/"):
-            continue
-        proposed = cmd[:m.start(1)] + "/" + flag_name + cmd[m.end(1):]
-        log_fixup(cmd, proposed, "doubled_flag")
-        block(f"Doubled // flags break Windows commands in Git Bash. "
-              f"Single / works.\n"
-              f"Original:  {cmd}\n"
-              f"Suggested: {proposed}")
+    start = _find_doubled_flag(cmd)
+    if start is None:
+        return
+    proposed = cmd[:start] + cmd[start + 1:]
+    log_fixup(cmd, proposed, "doubled_flag")
+    block(f"Doubled // flags break Windows commands in Git Bash. "
+          f"Single / works.\n"
+          f"Original:  {cmd}\n"
+          f"Suggested: {proposed}")
+
+
+_HEREDOC_RE = _LazyPattern(r"<<-?\s*['\"]?(\w+)['\"]?.*?\n(.*?\n)\1", re.DOTALL)
 
 
 def _strip_heredocs(cmd):
@@ -260,12 +348,30 @@ def _strip_heredocs(cmd):
     Heredoc content is text payload, not shell-interpreted paths.
     Stripping it prevents false positives in path checks.
     """
-    return re.sub(
-        r"<<-?\s*['\"]?(\w+)['\"]?.*?\n(.*?\n)\1",
-        r"",
-        cmd,
-        flags=re.DOTALL,
-    )
+    if "<<" not in cmd:
+        return cmd
+    return _HEREDOC_RE.sub("", cmd)
+
+
+def _single_quote_test(text):
+    """Return a predicate telling whether index i of text is inside single quotes.
+
+    A position counts as quoted when an odd number of ' precede it. The
+    quote positions are collected once, so each test is a bisect rather
+    than a count over text[:i].
+    """
+    if "'" not in text:
+        return lambda i: False
+    quotes = []
+    pos = text.find("'")
+    while pos != -1:
+        quotes.append(pos)
+        pos = text.find("'", pos + 1)
+    return lambda i: bisect_left(quotes, i) % 2 == 1
+
+
+_BACKSLASH_PATH_RE = _LazyPattern(r"(?<![A-Za-z])([A-Za-z]):\\([A-Za-z])")
+_BACKSLASH_PATH_SUB_RE = _LazyPattern(r"(?<![A-Za-z])[A-Za-z]:\\[^\s'\"]*")
 
 
 def check_backslash_paths(cmd):
@@ -275,23 +381,31 @@ def check_backslash_paths(cmd):
     strings.  The drive letter must be at a word boundary (not mid-word like
     HKCU\Software) to avoid false positives on registry paths.
     """
+    if ":\\" not in cmd:
+        return
     stripped = _strip_heredocs(cmd)
-    for m in re.finditer(r"(?<![A-Za-z])([A-Za-z]):\\([A-Za-z])", stripped):
-        # Skip if inside single quotes (count odd quotes before match)
-        before = stripped[:m.start()]
-        if before.count("'") % 2 == 1:
+    in_quotes = _single_quote_test(stripped)
+    for m in _BACKSLASH_PATH_RE.finditer(stripped):
+        # Skip if inside single quotes (odd number of quotes before match)
+        if in_quotes(m.start()):
             continue
-        proposed = re.sub(
-            r"(?<![A-Za-z])[A-Za-z]:\\[^\s'\"]*",
-            lambda m: m.group(0).replace("\\", "/"),
-            cmd,
-        )
+        parts = []
+        last = 0
+        for sm in _BACKSLASH_PATH_SUB_RE.finditer(cmd):
+            parts.append(cmd[last:sm.start()])
+            parts.append(sm.group(0).replace("\\", "/"))
+            last = sm.end()
+        parts.append(cmd[last:])
+        proposed = "".join(parts)
         log_fixup(cmd, proposed, "backslash_path")
         block(f"Windows backslash paths don't work reliably in Git Bash.\n"
               f"Original:  {cmd}\n"
               f"Suggested: {proposed}")
 
 
+_UNC_PATH_RE = _LazyPattern(r"(?:^|(?<=[\s\"'=]))\\\\([A-Za-z0-9._-]+)\\([^\s'\"]*)")
+
+
 def check_unc_paths(cmd):
     r"""Fix H: detect UNC paths with backslashes (\\server\share).
 
@@ -301,29 +415,36 @@ def check_unc_paths(cmd):
     escaped backslashes mid-word (e.g. HKCU\\Software in registry paths).
     """
     stripped = _strip_heredocs(cmd)
-    for m in re.finditer(r"(?:^|(?<=[\s\"'=]))\\\\([A-Za-z0-9._-]+)\\([^\s'\"]*)", stripped):
-        # Skip if inside single quotes
-        before = stripped[:m.start()]
-        if before.count("'") % 2 == 1:
+    in_quotes = _single_quote_test(stripped)
+    for m in _UNC_PATH_RE.finditer(stripped):
+        # Skip if inside single quotes (odd number of quotes before match)
+        if in_quotes(m.start()):
             continue
-        proposed = re.sub(
-            r"(?:^|(?<=[\s\"'=]))\\\\([A-Za-z0-9._-]+)\\([^\s'\"]*)",
-            lambda m: "//" + m.group(1) + "/" + m.group(2).replace("\\", "/"),
-            cmd,
-        )
+        parts = []
+        last = 0
+        for sm in _UNC_PATH_RE.finditer(cmd):
+            parts.append(cmd[last:sm.start()])
+            parts.append("//" + sm.group(1) + "/" + sm.group(2).replace("\\", "/"))
+            last = sm.end()
+        parts.append(cmd[last:])
+        proposed = "".join(parts)
         log_fixup(cmd, proposed, "unc_path")
         block(f"UNC paths with backslashes don't work in Git Bash.\n"
               f"Original:  {cmd}\n"
               f"Suggested: {proposed}")
 
 
+_WSL_COMMAND_RE = _LazyPattern(r"wsl(\.exe)?\s", re.IGNORECASE)
+_DRIVE_PREFIX_RE = _LazyPattern(r"[A-Za-z]:/")
+
+
 def check_wsl_invocation(cmd):
     """Block bare 'wsl' commands -- Claude is in Git Bash, not WSL."""
-    if not re.match(r"wsl(\.exe)?\s", cmd.lstrip(), re.IGNORECASE):
+    stripped = cmd.lstrip()
+    if not _WSL_COMMAND_RE.match(stripped):
         return
     # Allow full-path invocations as an intentional escape hatch
-    stripped = cmd.lstrip()
-    if re.match(r"[A-Za-z]:/", stripped):
+    if _DRIVE_PREFIX_RE.match(stripped):
         return
     if _is_wsl_installed():
         block(
@@ -339,19 +460,18 @@ def check_wsl_invocation(cmd):
         )
 
 
+_WSL_MOUNT_RE = _LazyPattern(r"/mnt/([a-zA-Z])/")
+
+
 def check_wsl_paths(cmd):
     """Block /mnt/c/ style paths -- these are WSL paths, not Git Bash paths."""
     if _in_wsl:
         return
     stripped = _strip_heredocs(cmd)
-    m = re.search(r"/mnt/([a-zA-Z])/", stripped)
+    m = _WSL_MOUNT_RE.search(stripped)
     if not m:
         return
-    proposed = re.sub(
-        r"/mnt/([a-zA-Z])/",
-        lambda m: m.group(1).upper() + ":/",
-        cmd,
-    )
+    proposed = _WSL_MOUNT_RE.sub(lambda m: m.group(1).upper() + ":/", cmd)
     log_fixup(cmd, proposed, "wsl_path")
     block(
         f"/mnt/{m.group(1)}/ is a WSL mount path. "
@@ -369,23 +489,31 @@ def check_reserved_names(cmd):
     undeletable files in Git Bash or redirect to hardware devices.
     Also catches reserved names used as file arguments (touch con, etc.).
     """
+    # Only the first reserved-name redirect and the first file-creating
+    # command are checked
+    rm = fm = None
+    for m in _RESERVED_RE.finditer(cmd):
+        if m.lastgroup == "redirect":
+            if rm is None and m.group("name").lower() in WINDOWS_RESERVED_NAMES:
+                rm = m
+        else:
+            fm = fm or m
+        if rm and fm:
+            break
+
     # Check redirects: > con, 2> prn, &> aux, > lpt1.txt, etc.
-    m = _RESERVED_RE.search(cmd)
-    if m:
-        name = m.group(2).lower()
-        if name != "nul":  # nul is auto-fixed in tier 1
+    if rm:
+        name = rm.group("name")
+        if name.lower() != "nul":  # nul is auto-fixed in tier 1
             log_fixup(cmd, None, "reserved_name_redirect")
-            block(f"'{m.group(2)}' is a Windows reserved device name. "
+            block(f"'{name}' is a Windows reserved device name. "
                   f"Redirecting to it will either send output to a hardware "
                   f"device or create an undeletable file.\n"
                   f"Use > /dev/null to discard output.")
 
     # Check file arguments: touch con, mkdir prn, etc.
-    # Look for reserved names as bare arguments after file-creating commands
-    file_cmds = r"\b(?:touch|mkdir|cp|mv|cat\s*>|tee)\s+"
-    fm = re.search(file_cmds + r"(\S+)", cmd)
     if fm:
-        filename = fm.group(1).strip("\"'")
+        filename = fm.group("filename").strip("\"'")
         basename = filename.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
         # Strip extension: con.txt -> con
         stem = basename.split(".", 1)[0].lower()
@@ -396,6 +524,9 @@ def check_reserved_names(cmd):
                   f"Choose a different filename.")
 
 
+_POWERSHELL_RE = _LazyPattern(r"powershell(\.exe)?\s", re.IGNORECASE)
+
+
 def check_powershell_legacy(cmd):
     """Block bare powershell.exe; prefer pwsh (PowerShell 7+).
 
@@ -404,7 +535,7 @@ def check_powershell_legacy(cmd):
     are allowed as an intentional escape hatch for PS 5.1 legacy use.
     """
     stripped = cmd.lstrip()
-    if re.match(r"powershell(\.exe)?\s", stripped, re.IGNORECASE):
+    if _POWERSHELL_RE.match(stripped):
         block(
             "Use pwsh (PowerShell 7+) instead of powershell.exe. "
             "powershell.exe invokes the legacy Windows PowerShell 5.1.\n"
@@ -414,6 +545,10 @@ def check_powershell_legacy(cmd):
         )
 
 
+_PWSH_COMMAND_RE = _LazyPattern(r"\bpwsh(?:\.exe)?\s+(?:-Command|-c)\b", re.IGNORECASE)
+_DIR_FLAG_RE = _LazyPattern(r"\bdir\s+(/[a-zA-Z])", re.IGNORECASE)
+
+
 def check_dir_in_pwsh(cmd):
     """Fix J: block cmd.exe-style 'dir /flag' inside pwsh -Command.
 
@@ -421,9 +556,9 @@ def check_dir_in_pwsh(cmd):
     cmd.exe flags. /b is resolved as a path under the current drive root
     (e.g. C:\\b), producing a confusing 'Cannot find path' error.
     """
-    if not re.search(r"\bpwsh(?:\.exe)?\s+(?:-Command|-c)\b", cmd, re.IGNORECASE):
+    if not _PWSH_COMMAND_RE.search(cmd):
         return
-    dm = re.search(r"\bdir\s+(/[a-zA-Z])", cmd, re.IGNORECASE)
+    dm = _DIR_FLAG_RE.search(cmd)
     if not dm:
         return
     flag = dm.group(1).lower()
@@ -441,37 +576,122 @@ def check_dir_in_pwsh(cmd):
     )
 
 
+# Cheap necessary condition for each tier-2 check, keyed by check group.
+# All triggers are scanned in one regex pass; a check only runs when its
+# trigger appears somewhere in the command. Each alternative is wrapped in
+# a lookahead so overlapping triggers cannot hide one another.
+_TIER2_TRIGGERS = (
+    ("git_commit", r"\bgit\s+commit\b"),
+    ("powershell_legacy", r"\A\s*(?i:powershell(?:\.exe)?)\s"),
+    ("wsl_invocation", r"\A\s*(?i:wsl(?:\.exe)?)\s"),
+    ("wsl_paths", r"/mnt/[a-zA-Z]/"),
+    ("dir_in_pwsh", r"(?i:\bpwsh(?:\.exe)?\s+(?:-Command|-c)\b)"),
+    ("reserved_names", r">|\b(?:touch|mkdir|cp|mv|tee)\s"),
+    ("doubled_flags", r"(?:^|(?<=\s))//[a-zA-Z]{1,4}(?=\s|$|\")"),
+    ("backslash_paths", r":\\"),
+    ("unc_paths", r"\\\\"),
+)
+
+_TIER2_RE = _LazyPattern(
+    "(?=" + "|".join(f"(?P<{name}>{pat})" for name, pat in _TIER2_TRIGGERS) + ")"
+)
+
+
+# Every trigger above contains at least one of these (lowercased) literals,
+# so a command with none of them can skip the regex scan entirely.
+_TIER2_LITERALS = (
+    ">", "/", "\\",
+    "git", "wsl", "powershell", "pwsh", "touch", "mkdir", "cp", "mv", "tee",
+)
+
+
+def _tier2_triggers(cmd):
+    """Return the set of tier-2 trigger names present in cmd."""
+    lower = cmd.lower()
+    if not any(lit in lower for lit in _TIER2_LITERALS):
+        return set()
+    return {m.lastgroup for m in _TIER2_RE.finditer(cmd)}
+
+
+# Tier-2 checks after check_git_commit, in the order they run. Each name is
+# both its trigger in _TIER2_TRIGGERS and its flag from _resolve_checks().
+_TIER2_CHECKS = (
+    ("powershell_legacy", check_powershell_legacy),
+    ("wsl_invocation", check_wsl_invocation),
+    ("wsl_paths", check_wsl_paths),
+    ("dir_in_pwsh", check_dir_in_pwsh),
+    ("reserved_names", check_reserved_names),
+    ("doubled_flags", check_doubled_flags),
+    ("backslash_paths", check_backslash_paths),
+    ("unc_paths", check_unc_paths),
+)
+
+
 # ---------------------------------------------------------------------------
 # Tier 1 -- auto-fixes (silently rewrite the command)
 # ---------------------------------------------------------------------------
 
-def fix_nul_redirect(cmd):
-    """Fix A: > nul -> > /dev/null (case-insensitive: NUL, Nul, nul)"""
-    return re.sub(
-        r"(?<!/dev/)((?:&|[012])?>)\s*nul\b",
-        r"\1 /dev/null",
-        cmd,
-        flags=re.IGNORECASE,
-    )
+# Simple token rewrites that share one regex pass, in reporting order:
+# (check_id, description for additionalContext)
+_SUBSTITUTION_FIXES = (
+    ("nul_redirect", "replaced > nul with > /dev/null"),
+    ("msys2_drive_paths", "converted MSYS2 drive paths to Windows style"),
+    ("python3", "replaced python3 with python"),
+)
 
+# Group names match the check_ids above.
+_SUBSTITUTION_RE = _LazyPattern(
+    r"(?P<nul_redirect>(?<!/dev/)(?P<redirect>(?:&|[012])?>)\s*(?i:nul)\b)"
+    r"|(?P<msys2_drive_paths>(?:^|(?<=\s))/(?P<drive>[a-zA-Z])/)"
+    r"|(?P<python3>\bpython3\b)"
+)
 
-def fix_msys2_drive_paths(cmd):
-    """Fix G: /c/Work/... -> C:/Work/...
+# Drive letter -> Windows drive prefix for the msys2_drive_paths rewrite
+_DRIVE_MAP = {
+    ch: ch.upper() + ":/"
+    for ch in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+}
 
-    MSYS2 drive mount paths (/c/, /d/, etc.) sometimes fail to convert
-    when passed to Windows executables like python.exe. Using C:/ style
-    is always safe for both MSYS2 tools and Windows executables.
-    """
-    return re.sub(
-        r"(?:^|(?<=\s))/([a-zA-Z])/",
-        lambda m: m.group(1).upper() + ":/",
-        cmd,
-    )
+# Substring each rewrite cannot match without
+_SUBSTITUTION_LITERALS = (
+    ("nul_redirect", ">"),
+    ("msys2_drive_paths", "/"),
+    ("python3", "python3"),
+)
 
 
-def fix_python3(cmd):
-    """Fix B: python3 -> python (Windows Store alias, not real Python)."""
-    return re.sub(r"\bpython3\b", "python", cmd)
+def fix_substitutions(cmd, enabled):
+    """Apply the enabled simple rewrites in a single pass.
+
+    Fix A: > nul -> > /dev/null (case-insensitive: NUL, Nul, nul)
+    Fix G: /c/Work/... -> C:/Work/...
+        MSYS2 drive mount paths (/c/, /d/, etc.) sometimes fail to convert
+        when passed to Windows executables like python.exe. Using C:/ style
+        is always safe for both MSYS2 tools and Windows executables.
+    Fix B: python3 -> python (Windows Store alias, not real Python).
+
+    Returns (fixed_cmd, set of check_ids that changed the command).
+    """
+    applied = set()
+    # Each rewrite needs its literal; skip the regex pass when no enabled
+    # rewrite can match (disabled ones would be put back verbatim anyway)
+    if not any(
+        kind in enabled and lit in cmd for kind, lit in _SUBSTITUTION_LITERALS
+    ):
+        return cmd, applied
+
+    def replace(m):
+        kind = m.lastgroup
+        if kind not in enabled:
+            return m.group(0)
+        applied.add(kind)
+        if kind == "nul_redirect":
+            return m.group("redirect") + " /dev/null"
+        if kind == "msys2_drive_paths":
+            return _DRIVE_MAP[m.group("drive")]
+        return "python"
+
+    return _SUBSTITUTION_RE.sub(replace, cmd), applied
 
 
 # Mapping of Windows cmd.exe 'dir' flags to GNU 'ls' equivalents
@@ -485,6 +705,18 @@ _DIR_FLAG_MAP = {
 }
 
 
+_DIR_HEAD_RE = _LazyPattern(r"^dir\b", re.IGNORECASE)
+
+# Letters accepted in a /flag or its :suffix -- what [a-zA-Z] matches under
+# re.IGNORECASE: ASCII plus four case variants (dotted/dotless i, long s,
+# Kelvin sign). As a flag these lowercase to keys missing from
+# _DIR_FLAG_MAP, so they leave the command unchanged.
+_DIR_FLAG_LETTERS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "\u0130\u0131\u017f\u212a"
+)
+
+
 def fix_dir_windows_flags(cmd):
     """Fix I: 'dir /flags [path]' -> 'ls [flags] [path]'.
 
@@ -492,30 +724,36 @@ def fix_dir_windows_flags(cmd):
     /flags are treated as paths, not switches. Only rewrites when all
     flags are in the known mapping; unknown flags pass through unchanged.
     """
-    if not re.match(r"^dir\b", cmd.strip(), re.IGNORECASE):
+    # Every rewrite needs at least one /flag
+    if "/" not in cmd or not _DIR_HEAD_RE.match(cmd.strip()):
         return cmd
 
     rest = cmd.strip()[3:].strip()  # everything after 'dir'
 
-    # Consume leading /flag tokens (e.g. /b, /s, /a:h)
+    # Consume leading /flag tokens (e.g. /b, /s, /a:h) in one scan
     flags = []
-    while True:
-        fm = re.match(r"^(/[a-zA-Z])(?::[a-zA-Z]*)?\s*(.*)", rest, re.DOTALL | re.IGNORECASE)
-        if not fm:
-            break
-        flags.append(fm.group(1).lower())
-        rest = fm.group(2)
+    i, n = 0, len(rest)
+    while i + 1 < n and rest[i] == "/" and rest[i + 1] in _DIR_FLAG_LETTERS:
+        flags.append(rest[i + 1].lower())
+        i += 2
+        if i < n and rest[i] == ":":  # attribute suffix, e.g. /a:h
+            i += 1
+            while i < n and rest[i] in _DIR_FLAG_LETTERS:
+                i += 1
+        while i < n and rest[i].isspace():
+            i += 1
+    rest = rest[i:]
 
     if not flags:
         return cmd  # no Windows-style flags found
 
     # Only auto-fix when all flags are known
-    if any(f[1] not in _DIR_FLAG_MAP for f in flags):
+    if any(f not in _DIR_FLAG_MAP for f in flags):
         return cmd
 
     ls_flags = []
     for f in flags:
-        mapped = _DIR_FLAG_MAP[f[1]]
+        mapped = _DIR_FLAG_MAP[f]
         if mapped and mapped not in ls_flags:
             ls_flags.append(mapped)
 
@@ -528,6 +766,12 @@ def fix_dir_windows_flags(cmd):
     return ls_cmd.strip()
 
 
+_PWSH_QUOTE_RE = _LazyPattern(
+    r'(pwsh(?:\.exe)?\s+(?:-Command|-c)\s+)"([^"]*)"',
+    re.IGNORECASE,
+)
+
+
 def fix_pwsh_quoting(cmd):
     """Fix D: pwsh -Command "...$..." -> single quotes.
 
@@ -535,11 +779,10 @@ def fix_pwsh_quoting(cmd):
     When the content has both $ and embedded single quotes, we can't
     auto-fix -- block with advice to use -File instead.
     """
-    m = re.search(
-        r'(pwsh(?:\.exe)?\s+(?:-Command|-c)\s+)"([^"]*)"',
-        cmd,
-        re.IGNORECASE,
-    )
+    # Nothing to fix without a double-quoted argument containing $
+    if '"' not in cmd or "$" not in cmd:
+        return cmd, None
+    m = _PWSH_QUOTE_RE.search(cmd)
     if not m:
         return cmd, None
 
@@ -558,28 +801,27 @@ def fix_pwsh_quoting(cmd):
     return fixed, None
 
 
+_START_TITLED_RE = _LazyPattern(r'^start\s+""\s+"([^"]+)"$')
+_START_QUOTED_RE = _LazyPattern(r'^start\s+"([^"]+)"$')
+_START_BARE_RE = _LazyPattern(r'^start\s+(\S+)$')
+
+
 def fix_start_command(cmd):
     """Fix K: start "" "path" -> python -c "import os; os.startfile('path')".
 
     'start' is a cmd.exe built-in. Git Bash has to spawn cmd.exe to run it.
     os.startfile() calls ShellExecuteW directly -- no extra process.
     """
-    m = re.match(
-        r'^start\s+""\s+"([^"]+)"$',
-        cmd.strip(),
-    )
+    stripped = cmd.strip()
+    if not stripped.startswith("start"):
+        return cmd
+    m = _START_TITLED_RE.match(stripped)
     if not m:
         # Also match without the empty title: start "path"
-        m = re.match(
-            r'^start\s+"([^"]+)"$',
-            cmd.strip(),
-        )
+        m = _START_QUOTED_RE.match(stripped)
     if not m:
         # Unquoted: start path (no spaces in path)
-        m = re.match(
-            r'^start\s+(\S+)$',
-            cmd.strip(),
-        )
+        m = _START_BARE_RE.match(stripped)
     if not m:
         return cmd
     path = m.group(1).replace("\\", "/")
@@ -591,9 +833,19 @@ def fix_start_command(cmd):
 # Main
 # ---------------------------------------------------------------------------
 
+# Lowercased literals at least one of which every check and fix needs: the
+# tier-2 triggers, plus python3 and start for the tier-1 fixes ('>' and '/'
+# already cover nul, drive paths and dir flags; 'pwsh' covers the quoting).
+_HOOK_LITERALS = _TIER2_LITERALS + ("python3", "start")
+
+
 def main():
+    raw = sys.stdin.buffer.read()
+    # Cheap byte check before parsing: only Bash payloads matter
+    if b'"Bash"' not in raw:
+        sys.exit(0)
     try:
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(raw)
     except (json.JSONDecodeError, ValueError):
         sys.exit(0)
 
@@ -602,59 +854,41 @@ def main():
     if not command:
         sys.exit(0)
 
+    # Plain commands (ls, grep, make, ...) hit no check at all
+    lower = command.lower()
+    if not any(lit in lower for lit in _HOOK_LITERALS):
+        sys.exit(0)
+
+    cfg = _resolve_checks()
     original = command
     fixes = []
 
     # -- Tier 2 checks (blocking) ------------------------------------------
-    if _is_enabled("git_commit_attribution", default=False):
-        check_git_commit_attribution(command)
-    if _is_enabled("git_commit_generated", default=False):
-        check_git_commit_generated(command)
-    if _is_enabled("git_commit_emoji", default=False):
-        check_git_commit_emoji(command)
-    if _is_enabled("powershell_legacy"):
-        check_powershell_legacy(command)
-    if _is_enabled("wsl_invocation"):
-        check_wsl_invocation(command)
-    if _is_enabled("wsl_paths"):
-        check_wsl_paths(command)
-    if _is_enabled("dir_in_pwsh"):
-        check_dir_in_pwsh(command)
-    if _is_enabled("reserved_names"):
-        check_reserved_names(command)
-    if _is_enabled("doubled_flags"):
-        check_doubled_flags(command)
-    if _is_enabled("backslash_paths"):
-        check_backslash_paths(command)
-    if _is_enabled("unc_paths"):
-        check_unc_paths(command)
+    triggers = _tier2_triggers(command)
+    if "git_commit" in triggers:
+        check_git_commit(
+            command,
+            attribution=cfg.git_commit_attribution,
+            generated=cfg.git_commit_generated,
+            emoji=cfg.git_commit_emoji,
+        )
+    for name, check in _TIER2_CHECKS:
+        if name in triggers and getattr(cfg, name):
+            check(command)
 
     # -- Tier 1 auto-fixes --------------------------------------------------
 
-    if _is_enabled("nul_redirect"):
-        command = fix_nul_redirect(command)
-        if command != original:
-            fixes.append("replaced > nul with > /dev/null")
-
-    if _is_enabled("msys2_drive_paths"):
-        prev = command
-        command = fix_msys2_drive_paths(command)
-        if command != prev:
-            fixes.append("converted MSYS2 drive paths to Windows style")
-
-    if _is_enabled("python3"):
-        prev = command
-        command = fix_python3(command)
-        if command != prev:
-            fixes.append("replaced python3 with python")
+    enabled = {cid for cid, _ in _SUBSTITUTION_FIXES if getattr(cfg, cid)}
+    command, applied = fix_substitutions(command, enabled)
+    fixes.extend(desc for cid, desc in _SUBSTITUTION_FIXES if cid in applied)
 
-    if _is_enabled("dir_windows_flags"):
+    if cfg.dir_windows_flags:
         prev = command
         command = fix_dir_windows_flags(command)
         if command != prev:
             fixes.append("converted Windows dir /flags to ls equivalent")
 
-    if _is_enabled("pwsh_quoting"):
+    if cfg.pwsh_quoting:
         prev = command
         command, pwsh_err = fix_pwsh_quoting(command)
         if pwsh_err:
@@ -662,7 +896,7 @@ def main():
         if command != prev:
             fixes.append("swapped pwsh -Command quotes from double to single")
 
-    if _is_enabled("start_command"):
+    if cfg.start_command:
         prev = command
         command = fix_start_command(command)
         if command != prev:
@@ -681,7 +915,7 @@ def main():
                 "additionalContext": "Hook auto-fixed: " + ", ".join(fixes),
             }
         }
-        json.dump(output, sys.stdout)
+        sys.stdout.buffer.write(json.dumps(output).encode("utf-8"))
 
     sys.exit(0)
 
@@ -13,6 +13,7 @@ affect that project -- useful for testing hooks in a sandbox.
 
 import argparse
 import json
+import os
 import shutil
 import sys
 from pathlib import Path
@@ -58,8 +59,13 @@ def copy_hooks(hooks_dst):
     """Copy all .py hook scripts and config.sample.json to the target directory."""
     hooks_dst.mkdir(parents=True, exist_ok=True)
     copied = 0
-    for src in sorted(HOOKS_SRC.glob("*.py")):
-        dst = hooks_dst / src.name
+    with os.scandir(HOOKS_SRC) as entries:
+        names = sorted(
+            e.name for e in entries if e.name.endswith(".py") and e.is_file()
+        )
+    for name in names:
+        src = HOOKS_SRC / name
+        dst = hooks_dst / name
         shutil.copy2(src, dst)
         print(f"  {src.name} -> {dst}")
         copied += 1
@@ -90,13 +96,34 @@ def patch_settings(settings_file, hooks_dst):
         with open(settings_file, "r", encoding="utf-8") as f:
             settings = json.load(f)
 
-    settings.setdefault("hooks", {})
-    settings["hooks"]["PreToolUse"] = hooks_config(hooks_dst)["PreToolUse"]
-
-    settings_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(settings_file, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
-        f.write("\n")
+    pre_tool_use = hooks_config(hooks_dst)["PreToolUse"]
+    hooks = settings.setdefault("hooks", {})
+    if hooks.get("PreToolUse") == pre_tool_use:
+        print(f"  {settings_file} already up to date")
+        return
+    hooks["PreToolUse"] = pre_tool_use
+
+    # Write a temp file next to the real file and swap it in, so an
+    # interrupted install never leaves a truncated settings file behind.
+    # Resolve first so a symlinked settings file (dotfiles setups) keeps
+    # its link and the target keeps its mode.
+    target = settings_file.resolve()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target.with_name(target.name + ".tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2)
+            f.write("\n")
+            # Data must be on disk before the rename, or a power loss can
+            # leave an empty settings file
+            f.flush()
+            os.fsync(f.fileno())
+        if target.exists():
+            shutil.copymode(target, tmp_file)
+        os.replace(tmp_file, target)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
     print(f"  Updated {settings_file}")
 
 